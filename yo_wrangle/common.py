@@ -1,5 +1,8 @@
 import configparser
 import json
+import os
+import shutil
+import sys
 from pathlib import Path
 from typing import Iterable, Dict, Optional
 
@@ -12,9 +15,35 @@ RED = "red"
 PURPLE = "purple"
 
 
+def _get_files_recursive(root_dir: Path, extension: str) -> Iterable[Path]:
+    """Recursively yields files below root_dir having the given extension.
+
+    Walks with os.scandir rather than pathlib.rglob so each directory
+    entry's type comes from the cached readdir result instead of a
+    stat() syscall per file - noticeably faster on large label trees.
+
+    A missing or unreadable directory yields nothing, matching the
+    rglob behaviour this replaced (callers rely on an absent
+    YOLO_darknet folder producing an empty result, not a crash).
+
+    """
+    try:
+        entries = os.scandir(str(root_dir))
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _get_files_recursive(Path(entry.path), extension)
+            elif entry.name.endswith(extension) and entry.is_file(
+                follow_symlinks=False
+            ):
+                yield Path(entry.path)
+
+
 def get_all_jpg_recursive(img_root: Optional[Path]) -> Iterable[Path]:
     if img_root.exists():
-        items = img_root.rglob("*.jpg")
+        items = _get_files_recursive(root_dir=img_root, extension=".jpg")
     else:
         print(f"WARNING. root_dir does not exist: {img_root}")
         items = []
@@ -23,10 +52,38 @@ def get_all_jpg_recursive(img_root: Optional[Path]) -> Iterable[Path]:
 
 
 def get_all_txt_recursive(root_dir: Path) -> Iterable[Path]:
-    for item in root_dir.rglob("*.txt"):
+    for item in _get_files_recursive(root_dir=root_dir, extension=".txt"):
         yield item
 
 
+def fast_copy(src: Path, dst: Path):
+    """
+    Copies file contents with minimal per-file overhead.
+
+    On Linux the bytes are moved kernel-side with os.sendfile, skipping
+    the samefile/symlink bookkeeping shutil.copyfile performs per call -
+    worthwhile in the dataset building loops which copy many thousands
+    of small image/annotation files. Everywhere else this simply
+    delegates to shutil.copyfile: macOS exposes os.sendfile too, but its
+    sendfile(2) only writes to sockets, so file-to-file calls there
+    raise ENOTSOCK. (shutil.copyfile itself uses sendfile on Linux from
+    Python 3.8, just with the extra per-call checks.)
+
+    """
+    if not sys.platform.startswith("linux"):
+        shutil.copyfile(src, dst)
+        return
+    with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+        remaining = os.fstat(f_src.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(f_dst.fileno(), f_src.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+
+
 def get_corrected_photo_name(photo_name: Path, expected_num_parts: int, sep: str = "_"):
     photo_ext = photo_name.suffix
     photo_split = photo_name.name.split(sep)
@@ -44,7 +101,7 @@ def get_id_to_label_map(classes_json_path: Path) -> Dict[int, str]:
     the provided file.
 
     """
-    with open(str(classes_json_path), "r") as json_file:
+    with open(classes_json_path, "r") as json_file:
         data = json.load(json_file)
     label_map = dict()
     for key, val in data.items():
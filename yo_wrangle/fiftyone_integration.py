@@ -1,5 +1,10 @@
+import functools
+import os
 import sys
 import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import fiftyone as fo
 import fiftyone.brain as fob
 import fiftyone.zoo as foz
@@ -21,42 +26,116 @@ ACCEPTABLE_ANNOTATION_FOLDERS = [
 ]
 
 
-def _extract_annotation(line: str, label_mapping: Dict[int, str]):
-    line_list = line.replace("\n", "").split(" ")
-    class_id: str = line_list[0].strip()
-    label = label_mapping.get(int(class_id), "Unknown")
-    yolo_box = [float(x) for x in line_list[1:5]]
-    if len(line_list) == 6:
-        confidence = line_list[5]
-    else:
-        confidence = None
-    return label, yolo_box, confidence
+def _make_labels_tuple(classes_map: Dict[int, str]) -> Tuple[str, ...]:
+    """Densifies an id->label dict into a tuple indexed by class id.
+
+    Class ids are small dense integers, so a single indexed load replaces
+    a dict hash + .get(default) per annotation in the hot parsing loops.
+
+    """
+    max_id = max(classes_map) if classes_map else -1
+    return tuple(classes_map.get(i, "Unknown") for i in range(max_id + 1))
 
 
-def _get_bounding_box(yolo_box: List[float]) -> List[float]:
-    width = yolo_box[2]
-    height = yolo_box[3]
-    centroid_x = yolo_box[0]
-    centroid_y = yolo_box[1]
+def _extract_annotations_per_line(
+    annotations_path: Path, labels_tuple: Tuple[str, ...]
+) -> List[Tuple[str, List[float], Optional[float]]]:
+    """Line-by-line fallback for annotation files np.loadtxt cannot parse
+    as one table, e.g. a mix of 5-column ground-truth rows and 6-column
+    detection rows. Produces the same (label, bounding_box, confidence)
+    tuples as the bulk path.
 
-    top_left_x = centroid_x - width / 2
-    top_left_y = centroid_y - height / 2
-    bounding_box = [top_left_x, top_left_y, width, height]
-    return bounding_box
+    """
+    annotations = []
+    num_labels = len(labels_tuple)
+    with open(annotations_path, "r") as annotations_file:
+        for line in annotations_file:
+            line_list = line.split()
+            if not line_list:
+                continue
+            class_id = int(line_list[0])
+            if 0 <= class_id < num_labels:
+                label = labels_tuple[class_id]
+            else:
+                label = "Unknown"
+            centre_x, centre_y, width, height = (
+                float(value) for value in line_list[1:5]
+            )
+            bounding_box = [
+                centre_x - width / 2,
+                centre_y - height / 2,
+                width,
+                height,
+            ]
+            if len(line_list) >= 6:
+                confidence = float(line_list[5])
+            else:
+                confidence = None
+            annotations.append((label, bounding_box, confidence))
+    return annotations
+
+
+def _extract_annotations_array(
+    annotations_path: Path, labels_tuple: Tuple[str, ...]
+) -> List[Tuple[str, List[float], Optional[float]]]:
+    """Reads a whole YOLO annotations file in one numpy pass and converts
+    every yolo box to a top-left-anchored bounding box with a single
+    broadcasted subtraction, instead of parsing and converting once per
+    line.
+
+    Returns a list of (label, bounding_box, confidence) tuples, where
+    confidence is None for ground-truth style files without a sixth column.
+
+    """
+    try:
+        arr = np.loadtxt(annotations_path, ndmin=2)
+    except ValueError:
+        # Ragged files (mixed 5- and 6-column lines) defeat the bulk
+        # parse; fall back to per-line parsing rather than dropping the
+        # whole file's annotations.
+        return _extract_annotations_per_line(
+            annotations_path=annotations_path, labels_tuple=labels_tuple
+        )
+    if arr.size == 0:
+        return []
+    class_ids = arr[:, 0].astype(int)
+    boxes = arr[:, 1:5].copy()
+    boxes[:, 0] -= boxes[:, 2] / 2
+    boxes[:, 1] -= boxes[:, 3] / 2
+    if arr.shape[1] >= 6:
+        confidences = arr[:, 5].tolist()
+    else:
+        confidences = [None] * len(class_ids)
+    num_labels = len(labels_tuple)
+    return [
+        (
+            labels_tuple[class_id] if 0 <= class_id < num_labels else "Unknown",
+            box,
+            confidence,
+        )
+        for class_id, box, confidence in zip(
+            class_ids.tolist(), boxes.tolist(), confidences
+        )
+    ]
 
 
-def _get_subset_folders(
+def _scan_dataset(
     dataset_root: Path = None, images_root: Path = None
-) -> List[Path]:
-    """Assumes all folders in the dataset_root are subset (subsample) folders with
-    the exception of folders reserved for annotations (including "YOLO_darknet",
-    "PASCAL_VOC", and "labels".
+) -> List[Tuple[Path, Path]]:
+    """Scans the dataset tree once, pairing every subset (subsample) folder
+    with its annotations root.
+
+    Assumes all folders in the dataset_root are subset folders with the
+    exception of folders reserved for annotations (including "YOLO_darknet",
+    "PASCAL_VOC", and "labels"). Within a subset, preference is given to
+    "YOLO_darknet" over "labels"; a subset with no annotation sub-folder is
+    assumed to keep its annotations side by side with the images.
 
     However, if dataset_root is None, will treat the images_root as
     though it is a sole subset. Note: Only accepts a Path for one of dataset_root
     or images_root. The other needs to be set to None.
 
-    Returns a list of the qualifying subset Paths.
+    Returns a sorted list of (subset_folder, annotations_root) tuples.
 
     :raises: an exception if both dataset_root and images_root are None,
              or if both of the params evaluate to not None.
@@ -72,49 +151,50 @@ def _get_subset_folders(
             )
         else:
             pass
-        subset_folders = [
-            folder
-            for folder in dataset_root.iterdir()
-            if folder.is_dir()
-            and folder.name
+        subset_folders = sorted(
+            Path(entry.path)
+            for entry in os.scandir(str(dataset_root))
+            if entry.is_dir(follow_symlinks=False)
+            and entry.name
             not in [
                 YOLO_ANNOTATIONS_FOLDER_NAME,
                 LABELS_FOLDER_NAME,
                 PASCAL_VOC_FOLDER_NAME,
             ]
-            and folder.name[0] != "."
-        ]
+            and entry.name[0] != "."
+        )
     else:
         raise Exception(
             "You need to provide a Path to either one of "
             "dataset_root (which contains subset sample folders) or images_root. "
             "Do not provide both."
         )
-    return sorted(subset_folders)
-
+    scanned_subsets = []
+    for subset_folder in subset_folders:
+        annotation_folders = sorted(
+            entry.name
+            for entry in os.scandir(str(subset_folder))
+            if entry.is_dir(follow_symlinks=False)
+            and entry.name in ACCEPTABLE_ANNOTATION_FOLDERS
+        )
+        if annotation_folders:
+            annotations_root = subset_folder / annotation_folders[-1]
+        else:
+            annotations_root = subset_folder
+        scanned_subsets.append((subset_folder, annotations_root))
+    return scanned_subsets
 
-def _get_annotations_root(subset_folder: Path) -> Path:
-    """Find an annotations root directory within a subset folder, where
-    a sub-folder is found having a name corresponding to one of the string sin
-    ACCEPTABLE_ANNOTATION_FOLDERS.
 
-    Give preference to "YOLO_darknet" over "labels".
+@functools.lru_cache(maxsize=2)
+def _load_embeddings_model(model_name: str = "wide-resnet101-2-imagenet-torch"):
+    """Loads (and caches) the zoo model used for computing embeddings.
 
-    If there are no sub folders within the subset_folder, the annotations_root
-    is assumed to be the same as the subset_folder (side by side with the
-    images).
+    Loading the model involves decoding ~100MB of weights, so repeated
+    calls to init_fifty_one_dataset() within one session should share
+    the one warm model rather than re-building it every time.
 
     """
-    folders = [
-        folder
-        for folder in subset_folder.iterdir()
-        if folder.is_dir() and folder.name in ACCEPTABLE_ANNOTATION_FOLDERS
-    ]
-    if len(folders) > 0:
-        ground_truths_root = sorted(folders)[-1]
-    else:
-        ground_truths_root = subset_folder
-    return ground_truths_root
+    return foz.load_zoo_model(model_name)
 
 
 def delete_fiftyone_dataset(dataset_label: str):
@@ -124,6 +204,66 @@ def delete_fiftyone_dataset(dataset_label: str):
         pass
 
 
+def _build_sample_payload(
+    image_path: Path,
+    ground_truths_folder: Path,
+    val_inferences_root: Optional[Path],
+    train_inferences_root: Optional[Path],
+    val_inference_stems: frozenset,
+    train_inference_stems: frozenset,
+    labels_tuple: Tuple[str, ...],
+    subset_name: str,
+    candidate_name: Optional[str],
+) -> Dict:
+    """Parses the annotation files for one image into a plain-dict payload.
+
+    This function is dispatched to worker processes; the fo.Sample objects
+    themselves are constructed on the main thread from the payloads since
+    fiftyone sample objects do not pickle safely.
+
+    """
+    payload = {
+        "filepath": str(image_path),
+        "ground_truth": [],
+        "predictions": [],
+        "tags": [],
+        "subset": subset_name,
+    }
+    ground_truths_path = ground_truths_folder / f"{image_path.stem}.txt"
+    if not ground_truths_path.exists():
+        print(f"Ground truth not exist: {str(ground_truths_path)}")
+        pass  # no detection(s) will be added to this sample.
+    else:
+        for label, bounding_box, _ in _extract_annotations_array(
+            annotations_path=ground_truths_path, labels_tuple=labels_tuple
+        ):
+            payload["ground_truth"].append((label, bounding_box))
+
+    inferences_path = None
+    if image_path.stem in val_inference_stems:
+        inferences_path = val_inferences_root / f"{image_path.stem}.txt"
+        payload["tags"].append("val")
+    elif image_path.stem in train_inference_stems:
+        inferences_path = train_inferences_root / f"{image_path.stem}.txt"
+        payload["tags"].append("train")
+    else:
+        pass  # No 'predictions' to populate
+
+    if inferences_path:
+        payload["predictions"].extend(
+            _extract_annotations_array(
+                annotations_path=inferences_path, labels_tuple=labels_tuple
+            )
+        )
+        payload["tags"].append("processed")
+
+    if candidate_name and subset_name == candidate_name:
+        payload["tags"].append("candidate")
+    else:
+        pass
+    return payload
+
+
 def init_fifty_one_dataset(
     dataset_label: str,
     classes_map: Dict[int, str],
@@ -137,86 +277,80 @@ def init_fifty_one_dataset(
 ):
     """Returns a fiftyOne dataset with uniqueness, mistakenness and evaluations."""
 
-    subset_folders = _get_subset_folders(dataset_root, images_root)
-    samples = []
-    for subset_folder in subset_folders:
-        if dataset_root is not None and ground_truths_root is None:
-            ground_truths_folder = _get_annotations_root(subset_folder=subset_folder)
-        else:
-            ground_truths_folder = ground_truths_root
-        subset_image_paths = list(get_all_jpg_recursive(img_root=subset_folder))
-        for image_path in subset_image_paths:
-            sample = fo.Sample(filepath=str(image_path))
-            detections = []
-            ground_truths_path = ground_truths_folder / f"{image_path.stem}.txt"
-            if not ground_truths_path.exists():
-                print(f"Ground truth not exist: {str(ground_truths_path)}")
-                pass  # no detection(s) will be added to this sample.
-            else:
-                with open(str(ground_truths_path), "r") as file_obj:
-                    annotation_lines = file_obj.readlines()
-
-                for line in annotation_lines:
-                    label, yolo_box, _ = _extract_annotation(
-                        line=line, label_mapping=classes_map
-                    )
-                    bounding_box = _get_bounding_box(yolo_box=yolo_box)
-                    detections.append(
-                        fo.Detection(label=label, bounding_box=bounding_box)
-                    )
-            predictions = []
-            inferences_path = None
-            if (
-                val_inferences_root
-                and (val_inferences_root / f"{image_path.stem}.txt").exists()
-            ):
-                inferences_path = val_inferences_root / f"{image_path.stem}.txt"
-                sample.tags.append("val")
-            elif (
-                train_inferences_root
-                and (train_inferences_root / f"{image_path.stem}.txt").exists()
-            ):
-                inferences_path = train_inferences_root / f"{image_path.stem}.txt"
-                sample.tags.append("train")
-            else:
-                pass  # No 'predictions' to populate
-
-            if inferences_path and inferences_path.exists():
-                with open(str(inferences_path), "r") as file_obj:
-                    annotation_lines = file_obj.readlines()
-                for line in annotation_lines:
-                    label, yolo_box, confidence = _extract_annotation(
-                        line=line, label_mapping=classes_map
-                    )
-                    bounding_box = _get_bounding_box(yolo_box=yolo_box)
-                    predictions.append(
-                        fo.Detection(
-                            label=label,
-                            bounding_box=bounding_box,
-                            confidence=confidence,
-                        )
+    scanned_subsets = _scan_dataset(dataset_root, images_root)
+    candidate_name = candidate_subset.name if candidate_subset else None
+    labels_tuple = _make_labels_tuple(classes_map)
+    # One directory listing per inferences root, instead of a stat() call
+    # (or two) per image in the worker processes.
+    val_inference_stems = frozenset(
+        path.stem for path in val_inferences_root.glob("*.txt")
+    ) if val_inferences_root else frozenset()
+    train_inference_stems = frozenset(
+        path.stem for path in train_inferences_root.glob("*.txt")
+    ) if train_inferences_root else frozenset()
+    def _iter_samples():
+        """Yields fo.Sample objects as the worker payloads stream in, so
+        add_samples can insert in batches without the whole dataset being
+        held in a Python list first."""
+        with ProcessPoolExecutor() as executor:
+            for subset_folder, annotations_root in scanned_subsets:
+                if dataset_root is not None and ground_truths_root is None:
+                    ground_truths_folder = annotations_root
+                else:
+                    ground_truths_folder = ground_truths_root
+                subset_image_paths = list(
+                    get_all_jpg_recursive(img_root=subset_folder)
+                )
+                payload_builder = functools.partial(
+                    _build_sample_payload,
+                    ground_truths_folder=ground_truths_folder,
+                    val_inferences_root=val_inferences_root,
+                    train_inferences_root=train_inferences_root,
+                    val_inference_stems=val_inference_stems,
+                    train_inference_stems=train_inference_stems,
+                    labels_tuple=labels_tuple,
+                    subset_name=subset_folder.name,
+                    candidate_name=candidate_name,
+                )
+                payloads = executor.map(
+                    payload_builder, subset_image_paths, chunksize=64
+                )
+                for payload in payloads:
+                    sample = fo.Sample(filepath=payload["filepath"])
+                    # Store detections in a field name of your choice
+                    sample["ground_truth"] = fo.Detections(
+                        detections=[
+                            fo.Detection(label=label, bounding_box=bounding_box)
+                            for label, bounding_box in payload["ground_truth"]
+                        ]
                     )
-                sample.tags.append("processed")
-
-            # Store detections in a field name of your choice
-            sample["ground_truth"] = fo.Detections(detections=detections)
-            sample["prediction"] = fo.Detections(
-                detections=predictions
-            )  # Should we do this if predictions is empty?
-            sample["subset"] = subset_folder.name
-
-            if candidate_subset and subset_folder.name == candidate_subset.name:
-                sample.tags.append("candidate")
-            else:
-                pass
-            samples.append(sample)
+                    sample["prediction"] = fo.Detections(
+                        detections=[
+                            fo.Detection(
+                                label=label,
+                                bounding_box=bounding_box,
+                                confidence=confidence,
+                            )
+                            for label, bounding_box, confidence in payload[
+                                "predictions"
+                            ]
+                        ]
+                    )  # Should we do this if predictions is empty?
+                    sample["subset"] = payload["subset"]
+                    for tag in payload["tags"]:
+                        sample.tags.append(tag)
+                    yield sample
 
     # Create dataset
     dataset = fo.Dataset(dataset_label)
-    dataset.add_samples(samples)
+    dataset.add_samples(_iter_samples())
     dataset.save()
-    model = foz.load_zoo_model("wide-resnet101-2-imagenet-torch")
-    embeddings = dataset.compute_embeddings(model=model)
+    model = _load_embeddings_model()
+    embeddings = dataset.compute_embeddings(
+        model=model,
+        batch_size=64,
+        num_workers=4,
+    )
     fob.compute_uniqueness(dataset, embeddings=embeddings)
     fob.compute_mistakenness(
         samples=dataset,
@@ -303,6 +437,14 @@ def _extract_filenames_by_tag(
     else:
         raise Exception(f"Dataset not found: {dataset_label} ")
 
+    # Tag matching is a cheap boolean test, so apply it before the more
+    # expensive per-label filtering to cut the documents the later
+    # pipeline stages have to scan.
+    if processed:
+        dataset = dataset.match_tags("processed")
+    else:
+        pass
+
     if label_filter:
         dataset = dataset.filter_labels(
             "ground_truth", ViewField("label") == label_filter
@@ -310,11 +452,6 @@ def _extract_filenames_by_tag(
     else:
         pass
 
-    if processed:
-        dataset = dataset.match_tags("processed")
-    else:
-        pass
-
     if tag == "mistakenness":
         dataset = dataset.sort_by("mistakenness", reverse=reverse)
         filtered_dataset = dataset.limit(limit)
@@ -347,7 +484,7 @@ def _extract_filenames_by_tag(
         else:  # e.g. tag is unknown
             pass
 
-    list_files_to_edit = [x.filepath for x in filtered_dataset]
+    list_files_to_edit = filtered_dataset.values("filepath")
     return list_files_to_edit, filtered_dataset
 
 
@@ -362,11 +499,13 @@ def edit_labels(filenames: List[str], class_names: List[str]):
     script_path = open_labeling_app.__file__
 
     import subprocess
+
+    # open_labeling is installed in this interpreter's environment, so
+    # launch sys.executable directly rather than bootstrapping poetry on
+    # every call.
     subprocess.check_call(
         args=[
-            "poetry",
-            "run",
-            "python",
+            sys.executable,
             f"{str(script_path)}",
             "--class-list",
             *class_names,
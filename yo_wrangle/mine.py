@@ -1,8 +1,7 @@
-import shutil
 from pathlib import Path
 from typing import Optional, List
 
-from common import YOLO_ANNOTATIONS_FOLDER_NAME
+from common import YOLO_ANNOTATIONS_FOLDER_NAME, fast_copy
 from wrangle import _get_hits_for_annotations_in_classes
 
 
@@ -54,8 +53,8 @@ def mine_annotations_for_target_classes(
     for image_name_stem in hit_list:
         src_annotation_path = src_annotations_dir / f"{image_name_stem}.txt"
         dst_annotation_path = dst_annotations_dir / f"{image_name_stem}.txt"
-        shutil.copy(src=str(src_annotation_path), dst=str(dst_annotation_path))
+        fast_copy(src=src_annotation_path, dst=dst_annotation_path)
 
         src_image_path = src_images_dir / f"{image_name_stem}.jpg"
         dst_image_path = dst_images_dir / f"{image_name_stem}.jpg"
-        shutil.copy(src=str(src_image_path), dst=str(dst_image_path))
+        fast_copy(src=src_image_path, dst=dst_image_path)
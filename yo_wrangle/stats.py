@@ -1,3 +1,4 @@
+import numpy
 import pandas
 from tabulate import tabulate
 
@@ -44,17 +45,21 @@ def count_class_instances_in_datasets(
             annotations_file = annotations_root / f"{image_path.stem}.txt"
             if not annotations_file.exists():
                 continue
-            with open(annotations_file, "r") as f:
-                lines = f.readlines()
-                for line in lines:
-                    class_id = int(line.strip().split(" ")[0])
-                    if class_id not in class_ids:
-                        continue
-                    class_name = class_id_to_name_map.get(class_id, class_id)
-                    if not dataset_dict.get(class_name, None):
-                        dataset_dict[class_name] = 1
-                    else:
-                        dataset_dict[class_name] += 1
+            try:
+                file_class_ids = numpy.loadtxt(
+                    annotations_file, usecols=0, ndmin=1
+                ).astype(int)
+            except ValueError:
+                print(f"Could not parse annotations file: {str(annotations_file)}")
+                continue
+            for class_id in file_class_ids.tolist():
+                if class_id not in class_ids:
+                    continue
+                class_name = class_id_to_name_map.get(class_id, class_id)
+                if not dataset_dict.get(class_name, None):
+                    dataset_dict[class_name] = 1
+                else:
+                    dataset_dict[class_name] += 1
 
         results_dict[dataset_name] = dataset_dict
 
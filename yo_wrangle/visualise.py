@@ -1,5 +1,9 @@
+import functools
+import queue
+import threading
+
 import numpy as np
-import pandas
+from concurrent.futures import ProcessPoolExecutor
 from cv2 import cv2
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -28,6 +32,8 @@ TEXT_POSITION_MAPPING = {
     },
 }
 LINE_THICKNESS = 2
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+POLYGON_IS_CLOSED = True
 MARGINAL_PROB_THRESH = 0.24
 
 # CLIENT SPECIFIC DATA
@@ -72,20 +78,19 @@ LABEL_MAPPING = {
 }
 
 
-def draw_polygon_on_image(
+def _draw_polygon_inplace(
     image: np.ndarray,
     yolo_box: List[List[float]],
-    dst_path: Path = None,
     label: Optional[str] = None,
     colour: str = "green",
     banner_height: Optional[int] = None,
-):
+) -> np.ndarray:
     """
-    This function takes a copy of an image and draws a bounding box
-    (polygon) according to the provided `yolo_box` parameter.
+    Draws a bounding box (polygon) directly onto the provided image array
+    according to the `yolo_box` parameter, and returns the mutated array.
 
-    If a `dst_path` is provided, the resulting image will be saved.
-    Otherwise, the image will be displayed in a pop up window.
+    Keeping this separate from any file IO means a caller can stack many
+    boxes onto one decoded image before saving it once.
 
     """
     height, width, _ = image.shape
@@ -94,21 +99,48 @@ def draw_polygon_on_image(
     else:
         pass
 
-    polygon_1 = [[x * width, y * height] for x, y in yolo_box]
-    polygon_1 = np.array(polygon_1, np.int32).reshape((-1, 1, 2))
-    is_closed = True
+    polygon_1 = (
+        (np.asarray(yolo_box, dtype=np.float64) * (width, height))
+        .astype(np.int32)
+        .reshape((-1, 1, 2))
+    )
 
     bgr_tuple = COLOUR_MAPPING[colour]
     text_position = (
         int(TEXT_POSITION_MAPPING[LEGEND_POSITION][colour][0] * width),
         int(TEXT_POSITION_MAPPING[LEGEND_POSITION][colour][1] * height),
     )
-    cv2.polylines(image, [polygon_1], is_closed, bgr_tuple, LINE_THICKNESS)
+    cv2.polylines(image, [polygon_1], POLYGON_IS_CLOSED, bgr_tuple, LINE_THICKNESS)
     if label:
-        font = cv2.FONT_HERSHEY_SIMPLEX
         cv2.putText(
-            image, label, text_position, font, 4, bgr_tuple, LINE_THICKNESS, cv2.LINE_AA
+            image, label, text_position, FONT, 4, bgr_tuple, LINE_THICKNESS, cv2.LINE_AA
         )
+    return image
+
+
+def draw_polygon_on_image(
+    image: np.ndarray,
+    yolo_box: List[List[float]],
+    dst_path: Path = None,
+    label: Optional[str] = None,
+    colour: str = "green",
+    banner_height: Optional[int] = None,
+):
+    """
+    This function takes a copy of an image and draws a bounding box
+    (polygon) according to the provided `yolo_box` parameter.
+
+    If a `dst_path` is provided, the resulting image will be saved.
+    Otherwise, the image will be displayed in a pop up window.
+
+    """
+    image = _draw_polygon_inplace(
+        image=image,
+        yolo_box=yolo_box,
+        label=label,
+        colour=colour,
+        banner_height=banner_height,
+    )
     if dst_path:
         cv2.imwrite(str(dst_path), image)
     else:
@@ -118,48 +150,126 @@ def draw_polygon_on_image(
     return image
 
 
-def get_dataframe_from_ai_file(ai_file_path):
+def read_defects_from_ai_file(ai_file_path) -> Tuple[bool, np.ndarray, np.ndarray]:
+    """
+    Reads the fixed-schema whitespace-separated AI detections file.
+
+    The file is parsed straight into numpy arrays - a full DataFrame
+    (dtype inference, index, block manager) was being built only to be
+    grouped and row-iterated immediately afterwards.
+
+    Returns a (has_probabilities, photo_names, defect_rows) tuple, where
+    photo_names is a string array and defect_rows holds the numeric
+    columns [Class_ID, x1, y1, ..., x4, y4(, prob)] row-for-row with
+    photo_names. has_probabilities is False for the 10-column file
+    variant that lacks the trailing prob column.
+
+    """
+    numeric_fields = [
+        (name, "f8")
+        for name in ["Class_ID", "x1", "y1", "x2", "y2", "x3", "y3", "x4", "y4"]
+    ]
     try:
-        df = pandas.read_csv(
-            filepath_or_buffer=ai_file_path,
-            header=None,
-            sep=" ",
-            usecols=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-            names=[
-                "Photo_Name",
-                "Class_ID",
-                "x1",
-                "y1",
-                "x2",
-                "y2",
-                "x3",
-                "y3",
-                "x4",
-                "y4",
-                "prob",
-            ],
+        data = np.loadtxt(
+            ai_file_path,
+            dtype=[("Photo_Name", "U256")] + numeric_fields + [("prob", "f8")],
+            ndmin=1,
+        )
+        has_probabilities = True
+    except (ValueError, IndexError):
+        data = np.loadtxt(
+            ai_file_path,
+            dtype=[("Photo_Name", "U256")] + numeric_fields,
+            ndmin=1,
+        )
+        has_probabilities = False
+    numeric_names = [field_name for field_name, _ in numeric_fields]
+    if has_probabilities:
+        numeric_names.append("prob")
+    defect_rows = np.stack([data[name] for name in numeric_names], axis=1)
+    return has_probabilities, data["Photo_Name"], defect_rows
+
+
+def _save_annotated_image(
+    image_path: str,
+    defect_rows: np.ndarray,
+    dst_path: str,
+    df_has_probabilities: bool,
+    foot_banner: Optional[np.ndarray],
+    banner_height: int,
+):
+    """
+    Decodes one image, draws every one of its defect bounding boxes, and
+    writes the annotated copy to dst_path.
+
+    Module-level so it can be dispatched to worker processes - the JPEG
+    decode/encode dominates the per-image cost and parallelises cleanly.
+
+    """
+    image = cv2.imread(image_path)
+    if hasattr(foot_banner, "shape"):
+        image = np.concatenate((image, foot_banner), axis=0)
+    else:
+        pass
+    height, width, _ = image.shape
+    if banner_height:
+        height = height - banner_height
+    else:
+        pass
+
+    # All of the image's polygons are scaled to pixels in one broadcasted
+    # multiply, then drawn with one polylines call per colour - polylines
+    # accepts a list of contours, so there is no per-defect crossing into
+    # OpenCV. The decoded array is encoded exactly once at the end.
+    polygons = (
+        (defect_rows[:, 1:9].reshape(-1, 4, 2) * (width, height))
+        .astype(np.int32)
+        .reshape(-1, 4, 1, 2)
+    )
+    polygons_by_colour = {}
+    labels_to_draw = []
+    for defect_idx, row in enumerate(defect_rows):
+        class_id = str(int(float(row[0])))
+        label = LABEL_MAPPING[class_id].get("label", "")
+        colour = LABEL_MAPPING[class_id].get("colour", GREEN)
+        if df_has_probabilities:
+            probability = row[9]
+            if probability < MARGINAL_PROB_THRESH:
+                colour = GREEN
+            else:
+                pass
+        else:
+            pass
+        polygons_by_colour.setdefault(colour, []).append(polygons[defect_idx])
+        if label:
+            labels_to_draw.append((label, colour))
+        else:
+            pass
+
+    for colour, colour_polygons in polygons_by_colour.items():
+        cv2.polylines(
+            image,
+            colour_polygons,
+            POLYGON_IS_CLOSED,
+            COLOUR_MAPPING[colour],
+            LINE_THICKNESS,
         )
-        return True, df
-    except Exception:
-        df = pandas.read_csv(
-            filepath_or_buffer=ai_file_path,
-            header=None,
-            sep=" ",
-            usecols=[0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
-            names=[
-                "Photo_Name",
-                "Class_ID",
-                "x1",
-                "y1",
-                "x2",
-                "y2",
-                "x3",
-                "y3",
-                "x4",
-                "y4",
-            ],
+    for label, colour in labels_to_draw:
+        text_position = (
+            int(TEXT_POSITION_MAPPING[LEGEND_POSITION][colour][0] * width),
+            int(TEXT_POSITION_MAPPING[LEGEND_POSITION][colour][1] * height),
         )
-        return False, df
+        cv2.putText(
+            image,
+            label,
+            text_position,
+            FONT,
+            4,
+            COLOUR_MAPPING[colour],
+            LINE_THICKNESS,
+            cv2.LINE_AA,
+        )
+    cv2.imwrite(dst_path, image, [cv2.IMWRITE_JPEG_QUALITY, 92])
 
 
 def save_bounding_boxes_on_images(
@@ -180,113 +290,72 @@ def save_bounding_boxes_on_images(
     if foot_banner_path:
         foot_banner = cv2.imread(str(foot_banner_path))
         banner_height, banner_width, _ = foot_banner.shape
-        foot_banner = cv2.resize(foot_banner, (1920, int(1920 * banner_height / 1904)))
+        foot_banner = cv2.resize(
+            foot_banner,
+            (1920, int(1920 * banner_height / 1904)),
+            interpolation=cv2.INTER_AREA,
+        )
     else:
         foot_banner = None
         banner_height = 0
 
-    df_has_probabilities, df = get_dataframe_from_ai_file(ai_file_path=ai_file_path)
-    images_with_defects = df["Photo_Name"].unique()
-    print("\nCount images with defects = ", len(images_with_defects))
+    df_has_probabilities, photo_names, defect_rows = read_defects_from_ai_file(
+        ai_file_path=ai_file_path
+    )
+    print("\nCount images with defects = ", len(np.unique(photo_names)))
     assert dst_root.exists() is False, "Destination directory already exists"
     dst_root.mkdir(parents=True)
 
+    # One pass to group rows per photo, then an O(1) dict lookup per image
+    # file, instead of a full-column equality scan for every image on disk.
+    row_idxs_by_photo_name = {}
+    for row_idx, photo_name in enumerate(photo_names.tolist()):
+        row_idxs_by_photo_name.setdefault(photo_name, []).append(row_idx)
+
+    image_paths = []
+    rows_per_image = []
+    dst_paths = []
     for img_path in get_all_jpg_recursive(img_root=images_root):
         photo_name = img_path.name
-        image_data = df.loc[df["Photo_Name"] == photo_name].reset_index()
-        if len(image_data) == 0:
+        row_idxs = row_idxs_by_photo_name.get(photo_name)
+        if row_idxs is None:
             continue
-        image = cv2.imread(str(img_path))
-        if hasattr(foot_banner, "shape"):
-            image = np.concatenate((image, foot_banner), axis=0)
-        else:
-            pass
-        for index, row in image_data.iterrows():
-            class_id = str(int(float(row["Class_ID"])))
-            series = row[
-                [
-                    "x1",
-                    "y1",
-                    "x2",
-                    "y2",
-                    "x3",
-                    "y3",
-                    "x4",
-                    "y4",
-                ]
-            ]
-            bounding_box_coords = [
-                [series["x1"], series["y1"]],
-                [series["x2"], series["y2"]],
-                [series["x3"], series["y3"]],
-                [series["x4"], series["y4"]],
-            ]
-            dst_path = dst_root / f"{img_path.stem}{img_path.suffix}"
-            label = LABEL_MAPPING[class_id].get("label", "")
-            colour = LABEL_MAPPING[class_id].get("colour", GREEN)
-            if df_has_probabilities:
-                probability = row["prob"]
-                if probability < MARGINAL_PROB_THRESH:
-                    colour = GREEN
-                else:
-                    pass
-            else:
-                pass
-            image = draw_polygon_on_image(
-                image=image,
-                yolo_box=bounding_box_coords,
-                dst_path=dst_path,
-                label=label,
-                colour=colour,
-                banner_height=banner_height,
-            )
-
-
-def _crop_image_for_given_centre(
-    img: np.ndarray,
-    dim: Tuple[int, int],
-    y_centre: float = 0.5,  # for centre_crop y_centre = 0.5
-):
-    """
-    Returns center cropped image unless the centre_crop parameter is set
-    to False, in which case cropping removes the image foreground.
-
-    Args:
-    img: image to be center cropped
-    dim: dimensions (width, height) to be cropped
-
-    """
-    width, height = img.shape[1], img.shape[0]
-
-    crop_width = dim[0] if dim[0] < img.shape[1] else img.shape[1]
-    crop_height = dim[1] if dim[1] < img.shape[0] else img.shape[0]
-
-    min_x = int(width / 2.0 - crop_width / 2.0)
-    max_x = int(width / 2.0 + crop_width / 2.0)
-
-    min_y = int(height * y_centre - crop_height / 2.0)
-    if min_y < 0:
-        print("min_y is less than 0")
-        min_y = 0
-    max_y = min_y + crop_height
-
-    if max_y > height:
-        print("max_y is greater than image height")
-        max_y = height
-        min_y = max_y - crop_height
-
-    crop_img = img[min_y:max_y, min_x:max_x]
-    return crop_img
+        image_paths.append(str(img_path))
+        rows_per_image.append(defect_rows[row_idxs])
+        dst_paths.append(str(dst_root / f"{img_path.stem}{img_path.suffix}"))
+
+    # Each image is independent, and decode/encode dominate, so fan the
+    # per-image work out across processes.
+    annotate = functools.partial(
+        _save_annotated_image,
+        df_has_probabilities=df_has_probabilities,
+        foot_banner=foot_banner,
+        banner_height=banner_height,
+    )
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(annotate, image_paths, rows_per_image, dst_paths, chunksize=8))
 
 
-def _scale_image(img: np.ndarray, factor: float):
+def _scale_image(img: np.ndarray, factor: float, interpolation: Optional[int] = None):
     """Returns resize image by scale factor.
     This helps to retain resolution ratio while resizing.
+
+    Unless an explicit cv2 interpolation flag is provided, INTER_AREA is
+    used when shrinking (box averaging: better quality and cheaper than
+    bilinear for downscales) and INTER_LINEAR when enlarging.
+
     Args:
     img: image to be scaled
     factor: scale factor to resize
+    interpolation: optional cv2.INTER_* flag overriding the default
     """
-    return cv2.resize(img, (int(img.shape[1] * factor), int(img.shape[0] * factor)))
+    if interpolation is None:
+        interpolation = cv2.INTER_AREA if factor < 1 else cv2.INTER_LINEAR
+    return cv2.resize(
+        img,
+        (int(img.shape[1] * factor), int(img.shape[0] * factor)),
+        interpolation=interpolation,
+    )
 
 
 def zoom_image(
@@ -309,12 +378,108 @@ def zoom_image(
     """
     width, height = image.shape[1], image.shape[0]
     factor = 100 / zoom_pcnt
-    image = _scale_image(img=image, factor=factor)
+    scaled_width = int(width * factor)
+    scaled_height = int(height * factor)
 
-    image = _crop_image_for_given_centre(
-        img=image, dim=(width, height), y_centre=y_centre
+    min_x = int(scaled_width / 2.0 - width / 2.0)
+    min_y = int(scaled_height * y_centre - height / 2.0)
+    if min_y < 0:
+        min_y = 0
+    if min_y + height > scaled_height:
+        min_y = scaled_height - height
+
+    # Scale and centre-crop fused into one warp: a single pass over the
+    # pixels writing straight into a frame-sized buffer, instead of
+    # materialising the oversized scaled intermediate and slicing it.
+    # The translation terms reproduce cv2.resize's half-pixel-centre
+    # sampling so the result matches the old scale-then-slice output.
+    fx = scaled_width / width
+    fy = scaled_height / height
+    matrix = np.array(
+        [
+            [fx, 0.0, 0.5 * fx - 0.5 - min_x],
+            [0.0, fy, 0.5 * fy - 0.5 - min_y],
+        ],
+        dtype=np.float64,
+    )
+    return cv2.warpAffine(
+        image,
+        matrix,
+        (width, height),
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REPLICATE,
+    )
+
+
+def _zoom_warp_matrix(
+    src_size: Tuple[int, int],
+    zoom_factor: float,
+    frame_size: Tuple[int, int],
+    y_centre: float = 0.5,
+) -> np.ndarray:
+    """
+    Builds the 2x3 affine matrix mapping a (width, height) source onto a
+    video frame zoomed by zoom_factor, using the same crop-window
+    arithmetic as zoom_image with the final downscale folded in.
+
+    """
+    width, height = src_size
+    scaled_width = int(width * zoom_factor)
+    scaled_height = int(height * zoom_factor)
+
+    min_x = int(scaled_width / 2.0 - width / 2.0)
+    min_y = int(scaled_height * y_centre - height / 2.0)
+    if min_y < 0:
+        min_y = 0
+    if min_y + height > scaled_height:
+        min_y = scaled_height - height
+
+    fx = scaled_width / width
+    fy = scaled_height / height
+    gx = frame_size[0] / width
+    gy = frame_size[1] / height
+    tx = 0.5 * fx - 0.5 - min_x
+    ty = 0.5 * fy - 0.5 - min_y
+    return np.array(
+        [
+            [gx * fx, 0.0, gx * tx + 0.5 * gx - 0.5],
+            [0.0, gy * fy, gy * ty + 0.5 * gy - 0.5],
+        ],
+        dtype=np.float64,
+    )
+
+
+def _zoomed_small_frame(
+    image: np.ndarray,
+    zoom_factor: float,
+    frame_size: Tuple[int, int],
+    y_centre: float = 0.5,
+    dst: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Returns a video-frame-sized image that is the source zoomed by
+    zoom_factor.
+
+    Producing each frame directly from the full-resolution source means
+    one interpolation per frame regardless of how deep into the zoom
+    sequence it is, where repeatedly re-zooming the previous frame both
+    compounds blur and touches every full-res pixel again.
+
+    """
+    matrix = _zoom_warp_matrix(
+        src_size=(image.shape[1], image.shape[0]),
+        zoom_factor=zoom_factor,
+        frame_size=frame_size,
+        y_centre=y_centre,
+    )
+    return cv2.warpAffine(
+        image,
+        matrix,
+        frame_size,
+        dst=dst,
+        flags=cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REPLICATE,
     )
-    return image
 
 
 def make_mp4_movie_from_images_in_dir(
@@ -323,6 +488,7 @@ def make_mp4_movie_from_images_in_dir(
     scale: float = 0.35,
     zoom_transition: bool = True,
     fps: float = 1.5,  # frames per second
+    codec: str = "mp4v",
 ):
     """
     For each of the images in a directory, 2 additional images that can help
@@ -335,28 +501,177 @@ def make_mp4_movie_from_images_in_dir(
     If zoom_transition is set to True, extra frames are added based on progressive
     zooming. May look good.
 
+    The codec defaults to mp4v for compatibility of the final artifact, but
+    passing "MJPG" (written to .avi) trades file size for a much faster
+    encoder - each frame is an independent JPEG - which is the better
+    choice for quick intermediate renders.
+
     """
     done_once = False
     fps = fps * 52 if zoom_transition else fps
-    for img_path in sorted(get_all_jpg_recursive(img_root=img_root)):
+    use_opencl = cv2.ocl.haveOpenCL()
+
+    # Decode the next few JPEGs on a producer thread while this thread is
+    # busy in the zoom loop, so the disk read/decode latency is hidden
+    # behind the per-image CPU work. The bounded queue caps memory. A
+    # dedicated sentinel marks end of stream, since cv2.imread itself
+    # returns None for a file it cannot decode.
+    decoded_images = queue.Queue(maxsize=4)
+    end_of_images = object()
+
+    def _prefetch_images():
+        for img_path in sorted(get_all_jpg_recursive(img_root=img_root)):
+            image = cv2.imread(filename=str(img_path))
+            if image is None:
+                print(f"WARNING. Could not decode image: {str(img_path)}")
+                continue
+            decoded_images.put(image)
+        decoded_images.put(end_of_images)
+
+    prefetch_thread = threading.Thread(
+        target=_prefetch_images, name="JpegPrefetch", daemon=True
+    )
+    prefetch_thread.start()
+
+    while True:
+        image = decoded_images.get()
+        if image is end_of_images:
+            break
+        image_small = _scale_image(img=image, factor=scale)
+        if not done_once:
+            frame_size = (image_small.shape[1], image_small.shape[0])
+            extension = "avi" if codec == "MJPG" else "mp4"
+            dst_file = img_root / f"an_output_video.{extension}"
+            out = cv2.VideoWriter(
+                str(dst_file), VideoWriter_fourcc(*codec), fps, frame_size
+            )
+            # Encode on a dedicated thread so the (GIL-releasing)
+            # VideoWriter.write overlaps the zoom warps instead of
+            # stalling them; the bounded queue caps frames in flight.
+            frames_to_encode = queue.Queue(maxsize=64)
+
+            def _encode_frames():
+                while True:
+                    frame_to_write = frames_to_encode.get()
+                    if frame_to_write is None:
+                        break
+                    out.write(image=frame_to_write)
+
+            writer_thread = threading.Thread(
+                target=_encode_frames, name="VideoEncode", daemon=True
+            )
+            writer_thread.start()
+            done_once = True
+
+        frames_to_encode.put(image_small)
+        if not zoom_transition:
+            continue
+        if use_opencl:
+            # T-API path: one upload per source image, all 20 warps run
+            # on the OpenCL device, and each small frame downloads as a
+            # fresh array ready for the writer queue.
+            src_size = (image.shape[1], image.shape[0])
+            warp_src = cv2.UMat(image)
+            for i in range(1, 21):
+                matrix = _zoom_warp_matrix(
+                    src_size=src_size,
+                    zoom_factor=(100 / 99.5) ** i,
+                    frame_size=frame_size,
+                    y_centre=y_centre,
+                )
+                frame = cv2.warpAffine(
+                    warp_src,
+                    matrix,
+                    frame_size,
+                    flags=cv2.INTER_LINEAR,
+                    borderMode=cv2.BORDER_REPLICATE,
+                )
+                frames_to_encode.put(frame.get())
+            continue
+        for i in range(1, 21):
+            zoom_factor = (100 / 99.5) ** i
+            frame = _zoomed_small_frame(
+                image=image,
+                zoom_factor=zoom_factor,
+                frame_size=frame_size,
+                y_centre=y_centre,
+            )
+            frames_to_encode.put(frame)
+
+    if done_once:
+        frames_to_encode.put(None)
+        writer_thread.join()
+
+
+def make_mp4_movie_from_video(
+    src_video: Path,
+    sample_every: int = 15,
+    y_centre: float = 0.5,
+    scale: float = 0.35,
+    zoom_transition: bool = True,
+    fps: float = 1.5,  # frames per second
+    codec: str = "mp4v",
+):
+    """
+    Same zoom-transition treatment as make_mp4_movie_from_images_in_dir
+    (including the codec choice), but sourcing the stills from an existing
+    video instead of a directory of JPEGs.
+
+    Only every sample_every-th frame is used. The stream is advanced with
+    VideoCapture.grab(), which parses but does not decode, so the skipped
+    frames never pay the full decode cost - only the retrieved frames do.
 
-        image = cv2.imread(filename=str(img_path))
+    """
+    capture = cv2.VideoCapture(str(src_video))
+    if not capture.isOpened():
+        raise RuntimeError(f"Could not open video: {str(src_video)}")
+
+    done_once = False
+    fps = fps * 52 if zoom_transition else fps
+    out = None
+    while True:
+        grabbed = True
+        for _ in range(sample_every):
+            grabbed = capture.grab()
+            if not grabbed:
+                break
+        if not grabbed:
+            break
+        okay, image = capture.retrieve()
+        if not okay:
+            break
         image_small = _scale_image(img=image, factor=scale)
         if not done_once:
             frame_size = (image_small.shape[1], image_small.shape[0])
-            dst_file = img_root / "an_output_video.mp4"
+            extension = "avi" if codec == "MJPG" else "mp4"
+            dst_file = src_video.parent / f"{src_video.stem}_sampled.{extension}"
             out = cv2.VideoWriter(
-                str(dst_file), VideoWriter_fourcc(*"mp4v"), fps, frame_size
+                str(dst_file), VideoWriter_fourcc(*codec), fps, frame_size
+            )
+            # out.write copies the frame into the encoder, so one scratch
+            # buffer can back every warp instead of allocating a fresh
+            # frame-sized array 20 times per source image.
+            frame_buf = np.empty(
+                (frame_size[1], frame_size[0], 3), dtype=np.uint8
             )
             done_once = True
 
         out.write(image=image_small)
         if not zoom_transition:
             continue
-        for i in range(20):
-            image = zoom_image(zoom_pcnt=99.5, image=image, y_centre=y_centre)
-            image_small = _scale_image(img=image, factor=scale)
-            out.write(image=image_small)
+        for i in range(1, 21):
+            zoom_factor = (100 / 99.5) ** i
+            frame = _zoomed_small_frame(
+                image=image,
+                zoom_factor=zoom_factor,
+                frame_size=frame_size,
+                y_centre=y_centre,
+                dst=frame_buf,
+            )
+            out.write(image=frame)
+    capture.release()
+    if out is not None:
+        out.release()
 
 
 def test_make_mp4_movie():
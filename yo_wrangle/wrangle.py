@@ -32,12 +32,14 @@ import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List, Tuple, Dict
 
 from yo_wrangle.dataset_versioning import commit_and_push
 from yo_wrangle.stats import count_class_instances_in_datasets
 from yo_wrangle.common import (
+    fast_copy,
     get_all_jpg_recursive,
     get_all_txt_recursive,
     YOLO_ANNOTATIONS_FOLDER_NAME,
@@ -52,6 +54,7 @@ def copy_images_recursive_inc_yolo_annotations_by_reference_dir(
     num: Optional[int] = None,
     move: bool = False,
     annotations_location: str = "yolo",  # "yolo" | "ref_yolo" | "labels"
+    every_n_th: int = 1,  # Set > 1 to uniformly subsample while copying.
 ):
     """
     Used mainly to copy images into a sample folder based on cropped YOLO
@@ -106,6 +109,8 @@ def copy_images_recursive_inc_yolo_annotations_by_reference_dir(
     ):
         if num and i >= num:
             break
+        if i % every_n_th != 0:
+            continue
         original_image_path = original_images_dir / reference_image_path.name
         if (
             annotations_location == "labels" and not original_image_path.exists()
@@ -148,7 +153,7 @@ def copy_images_recursive_inc_yolo_annotations_by_reference_dir(
     if annotations_location == "labels":
         for annotations_path in get_all_txt_recursive(root_dir=dst_annotations_dir):
             new_lines = []
-            with open(str(annotations_path), mode="r+") as f:
+            with open(annotations_path, mode="r+") as f:
                 lines = f.readlines()
                 for line in lines:
                     line_split = line.split(" ")
@@ -160,7 +165,7 @@ def copy_images_recursive_inc_yolo_annotations_by_reference_dir(
                         new_lines.append(f"{new_line}\n")
 
             if len(line_split) > 5:
-                with open(str(annotations_path), mode="w") as f:
+                with open(annotations_path, mode="w") as f:
                     f.writelines(new_lines)
 
 
@@ -187,19 +192,19 @@ def subsample_a_directory(
             continue
         outfile = dst_images_root / image_path.name
         if move:  # Move the image
-            shutil.move(src=str(image_path), dst=str(outfile))
+            shutil.move(src=image_path, dst=outfile)
         else:
-            shutil.copyfile(src=str(image_path), dst=str(outfile))
+            shutil.copyfile(src=image_path, dst=outfile)
 
         src_annotations_file = (
             src_images_root / YOLO_ANNOTATIONS_FOLDER_NAME / f"{image_path.stem}.txt"
         )
         dst_annotations_file = dst_annotations_root / f"{image_path.stem}.txt"
         if move:  # Move the annotation
-            shutil.move(src=str(src_annotations_file), dst=str(dst_annotations_file))
+            shutil.move(src=src_annotations_file, dst=dst_annotations_file)
         else:
             shutil.copyfile(
-                src=str(src_annotations_file), dst=str(dst_annotations_file)
+                src=src_annotations_file, dst=dst_annotations_file
             )
 
 
@@ -210,22 +215,21 @@ def copy_detect_folder_recursively_as_reference_then_subsample(
     annotations_location="labels",
     every_n_th=6,
 ):
-    temp_file = tempfile.mkdtemp()
-    temp_path = Path(temp_file)
+    """
+    Subsamples while copying, so each sampled file is written straight to
+    dst_sample_dir rather than staging the full detect folder in a
+    temporary directory only to re-read, subsample and delete it.
+
+    """
     copy_images_recursive_inc_yolo_annotations_by_reference_dir(
         reference_dir=reference_dir,
         original_images_dir=original_images_dir,
-        dst_sample_dir=temp_path,
+        dst_sample_dir=dst_sample_dir,
         num=None,
         move=False,
         annotations_location=annotations_location,
-    )
-    subsample_a_directory(
-        src_images_root=temp_path,
-        dst_images_root=dst_sample_dir,
         every_n_th=every_n_th,
     )
-    shutil.rmtree(str(temp_path))
 
 
 def collate_image_and_annotation_subsets(
@@ -249,6 +253,10 @@ def collate_image_and_annotation_subsets(
 
     """
     dst_folder.mkdir(exist_ok=True)
+    # Copies are deferred to a thread pool, so a destination cannot be
+    # relied on to exist() at enqueue time - names queued in this run are
+    # tracked here to keep the uniqueness check exact.
+    queued_image_names = set()
     for original_images_dir, sample_size in samples_required:
         assert (
             original_images_dir.exists()
@@ -262,16 +270,21 @@ def collate_image_and_annotation_subsets(
         assert (
             len(original_image_paths) > 0
         ), f"Subset path has no jpg files: {str(original_images_dir)}"
+        copy_jobs = []
         for i, original_image_path in enumerate(original_image_paths):
             if sample_size and i >= sample_size:
                 break
             dst_image_path = dst_folder / original_image_path.name
             # if dst_image_path.exists():
             #     dst_image_path = dst_folder / f"{original_image_path.stem}zzz{original_image_path.suffix}"
-            if dst_image_path.exists():
+            if (
+                dst_image_path.exists()
+                or original_image_path.name in queued_image_names
+            ):
                 print(f"File name is not unique, skipping {str(dst_image_path.name)}")
                 continue
-            shutil.copy(src=original_image_path, dst=dst_image_path)
+            queued_image_names.add(original_image_path.name)
+            copy_jobs.append((original_image_path, dst_image_path))
 
             src_annotations_path = (
                 src_annotations_dir / f"{original_image_path.stem}.txt"
@@ -282,10 +295,14 @@ def collate_image_and_annotation_subsets(
                 / f"{original_image_path.stem}.txt"
             )
             if src_annotations_path.exists():
-                shutil.copy(src=src_annotations_path, dst=dst_annotations_path)
+                copy_jobs.append((src_annotations_path, dst_annotations_path))
             else:
                 print(f"Annotation file not found: {str(src_annotations_path)}")
 
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for _ in executor.map(lambda paths: fast_copy(*paths), copy_jobs):
+                pass  # Drain the iterator so copy errors surface here.
+
         if keep_class_ids or skip_class_ids:
             filter_dataset_for_classes(
                 annotations_dir=dst_annotations_folder,
@@ -337,11 +354,11 @@ def split_yolo_train_dataset_every_nth(
             dst = dst_val_root
 
         dst_image_path = dst / "images" / image_path.name
-        shutil.copy(src=str(image_path), dst=str(dst_image_path))
+        shutil.copy(src=image_path, dst=dst_image_path)
 
         dst_annotations_file = dst / "labels" / src_annotations_file.name
         if src_annotations_file.exists():
-            shutil.copy(src=str(src_annotations_file), dst=str(dst_annotations_file))
+            shutil.copy(src=src_annotations_file, dst=dst_annotations_file)
         else:
             print(f"Annotation file not found: {str(src_annotations_file)}")
 
@@ -391,7 +408,7 @@ def _get_hits_for_annotations_in_classes(
     src_annotations_dir = src_images_dir / YOLO_ANNOTATIONS_FOLDER_NAME
     hit_list: List[str] = []
     for src_annotation_path in get_all_txt_recursive(root_dir=src_annotations_dir):
-        with open(str(src_annotation_path)) as f:
+        with open(src_annotation_path) as f:
             lines = f.readlines()
         for line in lines:
             class_idx = int(line.strip().split(" ")[0])
@@ -405,19 +422,19 @@ def delete_redundant_samples(
     sample_folder_to_clean: Path,
     other_sample_folders: List[Path],
 ):
-    reference_image_paths = []
+    reference_image_names = set()
     for sample_folder in other_sample_folders:
         for image_path in get_all_jpg_recursive(sample_folder):
-            reference_image_paths.append(image_path.name)
-    unique_images = []
+            reference_image_names.add(image_path.name)
+    unique_images = set()
     for image_path in get_all_jpg_recursive(sample_folder_to_clean):
         image_name = image_path.name
-        if image_name in reference_image_paths:
+        if image_name in reference_image_names:
             image_path.unlink()
         if image_name in unique_images:
             image_path.unlink()
         else:
-            unique_images.append(image_name)
+            unique_images.add(image_name)
 
 
 def prepare_unique_dataset_from_detections(
@@ -474,7 +491,7 @@ def filter_dataset_for_classes(
     """
 
     for annotations_path in get_all_txt_recursive(root_dir=annotations_dir):
-        with open(str(annotations_path), "r") as file:
+        with open(annotations_path, "r") as file:
             annotation_lines = file.readlines()
 
         new_lines = []
@@ -486,7 +503,9 @@ def filter_dataset_for_classes(
                 continue
             new_lines.append(annotation)
 
-        with open(str(annotations_path), "w") as file:
+        if new_lines == annotation_lines:
+            continue  # Nothing was filtered out; skip the rewrite.
+        with open(annotations_path, "w") as file:
             file.writelines(new_lines)
 
 
@@ -1,13 +1,42 @@
 import numpy
 import pandas
 from tabulate import tabulate
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from sklearn import metrics as skm
 from pathlib import Path
 
 from yo_wrangle.common import get_all_jpg_recursive, get_id_to_label_map
 
 
+def _classes_present(annotations_path: Path, num_classes: int) -> numpy.ndarray:
+    """
+    Returns a boolean vector flagging which class ids appear in a YOLO
+    annotations file.
+
+    The file is read in one gulp and only the leading class-id token of
+    each line is parsed, so there is no per-line split of the box
+    coordinates. A missing or empty file yields an all-False vector.
+
+    """
+    classifications = numpy.zeros(num_classes, dtype=bool)
+    if not annotations_path.exists():
+        return classifications
+    with open(annotations_path, "rb") as annotations_file:
+        data = annotations_file.read()
+    if not data.strip():
+        return classifications
+    class_ids = numpy.fromiter(
+        (
+            int(line.split(b" ", 1)[0])
+            for line in data.splitlines()
+            if line.strip()
+        ),
+        dtype=numpy.int64,
+    )
+    classifications[numpy.unique(class_ids)] = True
+    return classifications
+
+
 def get_truth_vs_inferred_dict_by_photo(
     images_root: Path,
     root_ground_truths: Path,
@@ -27,42 +56,57 @@ def get_truth_vs_inferred_dict_by_photo(
     a list of inferred classification for each image index.
 
     """
-    results_dict = {}
+    rows = []
+    image_paths = []
     for image_path in get_all_jpg_recursive(img_root=images_root):
         ground_truth_path = root_ground_truths / f"{image_path.stem}.txt"
-        actual_classifications = [False for i in range(num_classes)]
-        if ground_truth_path.exists():
-            with open(str(ground_truth_path), "r") as truth_file:
-                ground_truth_lines = truth_file.readlines()
-            for ground_truth_line in ground_truth_lines:
-                class_id = ground_truth_line.split(" ")[0]
-                actual_classifications[int(class_id)] = True
-        else:
-            pass  # ground_truth_classification already initialized to False
-
         inferred_annotations_path = (
             root_inferred_bounding_boxes / f"{image_path.stem}.txt"
         )
-        inferred_classifications = [False for i in range(num_classes)]
-        if inferred_annotations_path.exists():
-            with open(str(inferred_annotations_path), "r") as annotations_file:
-                inferred_annotations_lines = annotations_file.readlines()
-
-            for inference_line in inferred_annotations_lines:
-                class_id = inference_line.split(" ")[0]
-                inferred_classifications[int(class_id)] = True
-        else:
-            pass  # inference already initialized to False
-
-        results_dict[image_path] = {
-            "actual_classifications": numpy.array(actual_classifications),
-            "inferred_classifications": inferred_classifications,
-        }
-    df = pandas.DataFrame(results_dict)
-    df = df.transpose()
+        rows.append(
+            (
+                _classes_present(
+                    annotations_path=ground_truth_path, num_classes=num_classes
+                ),
+                _classes_present(
+                    annotations_path=inferred_annotations_path,
+                    num_classes=num_classes,
+                ),
+            )
+        )
+        image_paths.append(image_path)
+    df = pandas.DataFrame(
+        rows,
+        index=image_paths,
+        columns=["actual_classifications", "inferred_classifications"],
+    )
     return df
 
 
+def _get_metrics_for_all_classes(
+    df: pandas.DataFrame,
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """
+    Computes per-class precision, recall and f1-score vectors for every
+    class in one pass.
+
+    Stacks the per-image classification rows into two (N, num_classes)
+    boolean matrices then derives all three metrics from column-wise
+    true-positive / positive counts, instead of invoking a separate
+    sklearn scorer per class per metric.
+
+    """
+    truths = numpy.stack(df["actual_classifications"].to_list())
+    inferences = numpy.stack(df["inferred_classifications"].to_list())
+    true_positives = numpy.logical_and(truths, inferences).sum(axis=0)
+    predicted_positives = inferences.sum(axis=0)
+    actual_positives = truths.sum(axis=0)
+    precision = true_positives / numpy.maximum(predicted_positives, 1)
+    recall = true_positives / numpy.maximum(actual_positives, 1)
+    f1 = 2 * precision * recall / numpy.maximum(precision + recall, 1e-12)
+    return precision, recall, f1
+
+
 def _get_classification_metrics_for_group(
     df: pandas.DataFrame,
     idxs: List[int],
@@ -93,29 +137,9 @@ def _get_classification_metrics_for_group(
             group_inferences, numpy.array([y[idx] for y in y_inferences])
         )
 
-    labels = None
-    precision = skm.precision_score(
+    precision, recall, f1, _ = skm.precision_recall_fscore_support(
         y_true=group_truths,
         y_pred=group_inferences,
-        labels=labels,
-        pos_label=1,
-        average="binary",
-        sample_weight=None,
-        zero_division="warn",
-    )
-    recall = skm.recall_score(
-        y_true=group_truths,
-        y_pred=group_inferences,
-        labels=labels,
-        pos_label=1,
-        average="binary",
-        sample_weight=None,
-        zero_division="warn",
-    )
-    f1 = skm.f1_score(
-        y_true=group_truths,
-        y_pred=group_inferences,
-        labels=labels,
         pos_label=1,
         average="binary",
         sample_weight=None,
@@ -183,15 +207,13 @@ def analyse_model_binary_metrics(
 
     results = {}
     print_first_n = num_classes if print_first_n is None else print_first_n
+    precision, recall, f1 = _get_metrics_for_all_classes(df=df)
     for class_id in range(print_first_n):
         class_name = classes_map.get(class_id, "Unknown")
-        precision, recall, f1, _ = _get_classification_metrics_for_group(
-            df=df, idxs=[class_id]
-        )
         results[class_name] = {
-            "P": "{:.2f}".format(precision),
-            "R": "{:.2f}".format(recall),
-            "F1": "{:.2f}".format(f1),
+            "P": "{:.2f}".format(precision[class_id]),
+            "R": "{:.2f}".format(recall[class_id]),
+            "F1": "{:.2f}".format(f1[class_id]),
         }
 
     table_str = tabulate(